@@ -41,10 +41,16 @@ License:
 
 import dimod
 import neal.sampler
+import numpy as np
 
-import os
 import argparse
+import functools
 import logging
+import multiprocessing
+import warnings
+
+
+logger = logging.getLogger(__name__)
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -81,131 +87,316 @@ def parse_arguments() -> argparse.Namespace:
         "If not provided, it will be calculated as 75%% of the total weight."
         )
     )
+    # Define the number of processes that run the annealing reads.
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type = int,
+        default = 1,
+        help = (
+            "Number of processes that share the Simulated Annealing reads "
+            "(default: 1)."
+        )
+    )
 
     return parser.parse_args()
 
 
 def read_data(
         filename: str, capacity: int | None = None
-    ) -> tuple[list[int], list[int], int]:
+    ) -> tuple[np.ndarray, np.ndarray, int]:
     """Reads data from a given file and calculates the capacity of knapsack.
 
     The file contains the value and the weight of each item in a different
-    line and they are splitted with space. Files have utf-8 encoding.
+    line and they are splitted with space. Files have utf-8 encoding. Blank
+    lines are skipped, but there is no comment syntax.
 
     Args:
         filename: the path of the file that contains the values and weights.
         capacity: knapsack's capacity.
 
     Returns:
-        tuple with a list of values, a list of weights and the capacity.
+        tuple with an array of values, an array of weights and the capacity.
 
     Raises:
         FileNotFoundError: If the file does not exist.
-        ValueError: If an item doesn't have both `value` and `weight`.
+        ValueError: If the file has no items, an item doesn't have both
+            `value` and `weight`, or the capacity isn't positive.
     """
-    # Check if the file exists
-    if not os.path.exists(filename):
-        raise FileNotFoundError(f"The file '{filename}' does not exist.")
-
-    values = list[int]()
-    weights = list[int]()
-
-    # Fill the values and weights lists
-    with open(filename, "r", encoding="utf-8") as file:
-        for line in file:
-            parts = line.split()
-            # Check if every item is well defined.
-            if len(parts) != 2:
-                raise ValueError(
-                    ("Each line in the file must contain exactly "
-                     "two integers: value and weight.")
-                )
-
-            value, weight = map(int, parts)
-            values.append(value)
-            weights.append(weight)
+    # Parse the whole file at once with NumPy's C reader. Given the path,
+    # it reads the raw file in chunks, which is faster than a text handle,
+    # and reports a missing file itself.
+    try:
+        with warnings.catch_warnings():
+            # An empty file is reported below, instead of NumPy's warning.
+            warnings.filterwarnings(
+                "ignore", message="loadtxt: input contained no data"
+            )
+            items = np.loadtxt(
+                filename,
+                dtype=np.int64,
+                ndmin=2,
+                encoding="utf-8",
+                comments=None
+            )
+    except FileNotFoundError:
+        raise FileNotFoundError(
+            f"The file '{filename}' does not exist."
+        ) from None
+    except ValueError as e:
+        raise ValueError(
+            ("Each line in the file must contain exactly "
+             "two integers: value and weight.")
+        ) from e
+
+    if not items.size:
+        raise ValueError(f"The file '{filename}' contains no items.")
+
+    # Check if every item is well defined.
+    if items.shape[1] != 2:
+        raise ValueError(
+            ("Each line in the file must contain exactly "
+             "two integers: value and weight.")
+        )
+
+    # Store values and weights as two contiguous arrays.
+    values, weights = items.T.copy()
 
     # In case capacity is not given, we define weight capacity to be equal
-    # to 75% of the total weight.
-    if not capacity:
-        capacity = int(0.75 * sum(weights))
+    # to 75% of the total weight, using exact integer arithmetic.
+    if capacity is None:
+        capacity = (3 * int(weights.sum())) // 4
+
+    # A knapsack without capacity would zero the penalty of the constraint.
+    if capacity <= 0:
+        raise ValueError("The capacity of the knapsack must be positive.")
 
     return values, weights, capacity
 
 
+def _fill_qubo(
+        values: np.ndarray,
+        weights: np.ndarray,
+        capacity: int,
+        penalty_weight: int,
+        q_matrix: np.ndarray
+    ) -> None:
+    """Writes the symmetric knapsack QUBO into a preallocated matrix.
+
+    dimod adds the upper and the lower triangle of a dense matrix together,
+    so each off-diagonal pair holds half of its coefficient. The whole
+    matrix is then a single outer product, with no per-row work.
+
+    Args:
+        values: Array with the values of items.
+        weights: Array with the weights of items.
+        capacity: Maximum weight capacity of the knapsack.
+        penalty_weight: Penalty of the capacity constraint.
+        q_matrix: n x n output matrix.
+    """
+    # All products are taken in float64, as int64 would silently wrap around
+    # for large weights.
+    float_weights = weights.astype(np.float64)
+
+    # Off-diagonal terms: P * w_i * w_j + P * w_j * w_i = 2 * P * w_i * w_j
+    np.outer(penalty_weight * float_weights, float_weights, out=q_matrix)
+
+    # Diagonal terms: - v_i + P * w_i^2 - 2 * P * W * w_i, where the outer
+    # product has already filled in P * w_i^2.
+    q_matrix.flat[::len(weights) + 1] += (
+        - values.astype(np.float64)
+        - 2 * penalty_weight * capacity * float_weights
+    )
+
+
 def build_knapsack_bqm(
-        values: list[int], weights: list[int], capacity: int
+        values: np.ndarray, weights: np.ndarray, capacity: int
     ) -> dimod.BinaryQuadraticModel:
     """Construct a bqm for the knapsack problem.
     
     Creates a Binary Quadratic Model based on a QUBO formulation of a 0/1
-    knapsack problem. It is described in the README.md file.
+    knapsack problem. It is described in the README.md file. Models are
+    cached, so building the same problem again only copies the cached one.
 
     Args:
-        values: List with the values of items.
-        weights: List with the weights of items.
+        values: Array with the values of items.
+        weights: Array with the weights of items.
         capacity: Maximum weight capacity of the knapsack.
 
     Returns:
         BinaryQuadraticModel representing the 0/1 knapsack problem.
     """
+    # Key the cache on the raw int64 buffers, not on tuples of boxed ints.
+    bqm = _build_knapsack_bqm_cached(
+        np.asarray(values, dtype=np.int64).tobytes(),
+        np.asarray(weights, dtype=np.int64).tobytes(),
+        capacity
+    )
+
+    # Hand out a copy, so callers can't modify the cached model.
+    return bqm.copy()
 
-    q_matrix = dict()
-    # TODO: comment the two lines below.
+
+@functools.lru_cache(maxsize=32)
+def _build_knapsack_bqm_cached(
+        values: bytes, weights: bytes, capacity: int
+    ) -> dimod.BinaryQuadraticModel:
+    """Construct a bqm for the knapsack problem from hashable arguments.
+
+    Args:
+        values: Buffer of the int64 array with the values of items.
+        weights: Buffer of the int64 array with the weights of items.
+        capacity: Maximum weight capacity of the knapsack.
+
+    Returns:
+        BinaryQuadraticModel representing the 0/1 knapsack problem.
+    """
+    values = np.frombuffer(values, dtype=np.int64)
+    weights = np.frombuffer(weights, dtype=np.int64)
+
+    # Number of items, equal to the number of binary variables.
     n = len(weights)
 
-    penalty_weight = int(sum(values)*capacity/sum(weights))
+    # Python ints can't overflow, unlike the int64 sums.
+    penalty_weight = int(int(values.sum())*capacity/int(weights.sum()))
 
-    for i in range(n):
-        for j in range(i, n):
-            if i == j:
-                # Diagonal terms: - v_i + P * w_i^2 - 2 * P * W * w_i
-                q_matrix[(i, j)] = (
-                    - values[i]
-                    + penalty_weight * (weights[i]**2)
-                    - 2 * penalty_weight * capacity * weights[i]
-                )
-            else:
-                # Off-diagonal terms: 2 * P * w_i * w_j
-                q_matrix[(i, j)] = 2 * penalty_weight * weights[i] * weights[j]
+    q_matrix = np.empty((n, n), dtype=np.float64)
+    _fill_qubo(values, weights, capacity, penalty_weight, q_matrix)
 
-    bqm = dimod.BinaryQuadraticModel.from_qubo(q_matrix)
+    # dimod ingests the dense matrix directly, without a dict of tuples.
+    bqm = dimod.BinaryQuadraticModel(q_matrix, vartype="BINARY")
 
     return bqm
 
 
+def _sample_chunk(
+        args: tuple[dimod.BinaryQuadraticModel, int, int]
+    ) -> dimod.SampleSet:
+    """Runs one batch of Simulated Annealing reads inside a worker process.
+
+    Args:
+        args: tuple with the bqm, the number of reads and the seed.
+
+    Returns:
+        Samples of the batch.
+    """
+    bqm, num_reads, seed = args
+    sampler = neal.SimulatedAnnealingSampler()
+
+    return sampler.sample(bqm, num_reads = num_reads, seed = seed)
+
+
+def sample_bqm(
+        bqm: dimod.BinaryQuadraticModel,
+        num_reads: int = 25,
+        workers: int = 1,
+        seed: int | None = None
+    ) -> dimod.SampleSet:
+    """Solves a bqm with Simulated Annealing, optionally in many processes.
+
+    The reads are independent, so they are split into one batch per worker
+    process and the samples of all batches are concatenated.
+
+    Args:
+        bqm: Binary Quadratic Model to be solved.
+        num_reads: Total number of annealing reads.
+        workers: Number of processes that share the reads.
+        seed: Seed for reproducible results.
+
+    Returns:
+        Samples of all the reads.
+    """
+    if workers <= 1:
+        return _sample_chunk((bqm, num_reads, seed))
+
+    # Every batch needs its own seed, or forked workers repeat the same reads.
+    seeds = np.random.default_rng(seed).integers(2**31, size = workers)
+    batches = [
+        (bqm, num_reads // workers + (i < num_reads % workers), int(seeds[i]))
+        for i in range(workers)
+    ]
+    # Drop empty batches, when there are more workers than reads.
+    batches = [batch for batch in batches if batch[1] > 0]
+
+    with multiprocessing.Pool(len(batches)) as pool:
+        samplesets = pool.map(_sample_chunk, batches)
+
+    return dimod.concatenate(samplesets)
+
+
+def solve_knapsack(
+        filename: str,
+        capacity: int | None = None,
+        num_reads: int = 25,
+        workers: int = 1,
+        seed: int | None = None
+    ) -> tuple[dimod.SampleSet, np.ndarray, np.ndarray, int]:
+    """Reads, builds and solves a knapsack problem in a single call.
+
+    The arrays from the file go straight into the QUBO matrix and the cached
+    bqm is sampled as is, since sampling doesn't modify it, so the pipeline
+    never copies the n x n model.
+
+    Args:
+        filename: the path of the file that contains the values and weights.
+        capacity: knapsack's capacity.
+        num_reads: Total number of annealing reads.
+        workers: Number of processes that share the reads.
+        seed: Seed for reproducible results.
+
+    Returns:
+        tuple with the samples, the array of values, the array of weights
+        and the capacity that was used.
+    """
+    # Read data from the file
+    logger.info("Reading data from file: %s", filename)
+    values, weights, capacity = read_data(filename, capacity)
+    logger.info("Number of items: %d", len(values))
+    logger.info("Total possible weight: %d", weights.sum())
+    logger.info("Using capacity: %s", capacity)
+
+    # Build the Binary Quadratic Model (BQM)
+    logger.info("Building the Binary Quadratic Model (BQM)...")
+    bqm = _build_knapsack_bqm_cached(
+        values.tobytes(), weights.tobytes(), capacity
+    )
+
+    # Solve the problem using Simulated Annealing
+    logger.info("Solving the problem using Simulated Annealing...")
+    sampleset = sample_bqm(bqm, num_reads, workers, seed)
+
+    return sampleset, values, weights, capacity
+
+
 def show_solution(
-    sampleset: dimod.SampleSet, values: list[int], weights: list[int]
+    sampleset: dimod.SampleSet, values: np.ndarray, weights: np.ndarray
     ) -> None:
     """Prints the selected items and infos about the answer.
 
     Args:
         sampleset: Samples returned by a dimod sampler.
-        values: List with the values of items.
-        weights: List with the weights of items.
+        values: Array with the values of items.
+        weights: Array with the weights of items.
     """
 
-    # gather repeated samples together and create a new SampleSet.
-    samples = sampleset.aggregate()
     # keep the lowest energy sample as solution.
-    solution = samples.first
-    # make a list with the answer's selected items
-    selected_items = [i for i, x in solution.sample.items() if x == 1]
-
-    selected_values = list[int]()
-    selected_weights = list[int]()
-
-    for i in selected_items:
-        selected_values.append(values[i])
-        selected_weights.append(weights[i])
+    solution = sampleset.first
+    # the variables are the item indices, so keep the labels of the selected
+    # variables, whatever the order of the sampleset's variables is.
+    sample = np.fromiter(
+        solution.sample.values(), dtype=np.int8, count=len(solution.sample)
+    )
+    labels = np.fromiter(
+        solution.sample.keys(), dtype=np.int64, count=len(solution.sample)
+    )
+    selected_items = np.sort(labels[sample == 1])
 
     # TODO: check if the solution is valid.
 
-    total_value = sum(selected_values)
-    total_weight = sum(selected_weights)
+    total_value = int(values[selected_items].sum())
+    total_weight = int(weights[selected_items].sum())
 
-    print(f"items of solution: {selected_items}")
+    print(f"items of solution: {selected_items.tolist()}")
     print(f"with total value:{total_value}")
     print(f"with total weight:{total_weight}")
 
@@ -216,26 +407,11 @@ def main():
 
     # Set up logging
     logging.basicConfig(level = logging.INFO, format = "%(message)s")
-    logger = logging.getLogger(__name__)
 
     try:
-        # Read data from the file
-        logger.info("Reading data from file: %s", args.file)
-        values, weights, capacity = read_data(
-            filename=args.file, capacity=args.capacity
+        sampleset, values, weights, _ = solve_knapsack(
+            args.file, args.capacity, num_reads = 25, workers = args.workers
         )
-        logger.info("Number of items: %d", len(values))
-        logger.info("Total possible weight: %d", sum(weights))
-        logger.info("Using capacity: %s", capacity)
-
-        # Build the Binary Quadratic Model (BQM)
-        logger.info("Building the Binary Quadratic Model (BQM)...")
-        bqm = build_knapsack_bqm(values, weights, capacity)
-
-        # Solve the problem using Simulated Annealing
-        logger.info("Solving the problem using Simulated Annealing...")
-        sampler = neal.SimulatedAnnealingSampler()
-        sampleset = sampler.sample(bqm, num_reads = 25)
 
         # Present the answer.
         logger.info("Solution:")
@@ -1,4 +1,6 @@
+import math
 import unittest
+import numpy as np
 
 from knapsack import read_data, build_knapsack_bqm
 
@@ -37,5 +39,52 @@ class TestBuildKnapsackBqm(unittest.TestCase):
         self.assertEqual(bqm.linear, expected_linear_terms)
         self.assertEqual(bqm.quadratic, expected_quadratic_terms)
 
+    def assert_exact_bqm(self, values, weights, capacity):
+        """Compare the BQM with coefficients computed with Python ints."""
+        bqm = build_knapsack_bqm(values, weights, capacity)
+
+        values, weights = values.tolist(), weights.tolist()
+        p = int(sum(values)*capacity/sum(weights))
+
+        for i, (v, w) in enumerate(zip(values, weights)):
+            expected = -v + p * w**2 - 2 * p * capacity * w
+            self.assertTrue(
+                math.isclose(bqm.linear[i], expected, rel_tol=1e-12)
+            )
+
+        for (i, j), bias in bqm.quadratic.items():
+            expected = 2 * p * weights[i] * weights[j]
+            self.assertTrue(math.isclose(bias, expected, rel_tol=1e-12))
+
+    def test_large_capacity(self):
+        """Test a problem whose linear terms don't fit in int64."""
+        rng = np.random.default_rng(5)
+        values = rng.integers(1, 10**5, size=200)
+        weights = rng.integers(1, 10**5, size=200)
+        capacity = (3 * int(weights.sum())) // 4
+
+        self.assert_exact_bqm(values, weights, capacity)
+
+    def test_large_weights(self):
+        """Test a problem whose quadratic terms don't fit in int64."""
+        values = np.full(50, 10**9)
+        weights = np.full(50, 10**9)
+        capacity = (3 * int(weights.sum())) // 4
+
+        self.assert_exact_bqm(values, weights, capacity)
+
+    def test_cached_bqm_is_copied(self):
+        """Test that rebuilding a problem returns an independent BQM."""
+        values_f, weights_f, capacity = read_data('data/very_small.txt', 10)
+
+        bqm = build_knapsack_bqm(values_f, weights_f, capacity)
+        bqm.add_linear(0, 1)
+        rebuilt_bqm = build_knapsack_bqm(values_f, weights_f, capacity)
+
+        # Changes on a returned BQM must not leak into the cached one.
+        self.assertIsNot(bqm, rebuilt_bqm)
+        self.assertEqual(bqm.linear[0] - 1, rebuilt_bqm.linear[0])
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,6 +1,7 @@
 import unittest
 import tempfile
 import os
+import warnings
 
 from knapsack import read_data
 
@@ -21,8 +22,8 @@ class TestReadData(unittest.TestCase):
         weights = [12, 27, 11, 17, 20, 10, 15]
         values_from_f, weights_from_f, w = read_data('data/small.txt')
         
-        self.assertEqual(values, values_from_f)
-        self.assertEqual(weights, weights_from_f)
+        self.assertEqual(values, values_from_f.tolist())
+        self.assertEqual(weights, weights_from_f.tolist())
         self.assertEqual(w, int(0.75 * sum(weights)))
 
     def test_invalid_file(self):
@@ -42,6 +43,41 @@ class TestReadData(unittest.TestCase):
             f"Each line in the file must contain exactly two integers: value and weight."
         )
 
+    def test_empty_file(self):
+        """Test reading a file without any items."""
+        # Check if ValueError is raised, without NumPy's warning
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            with self.assertRaises(ValueError) as context:
+                read_data(self.filename)
+
+        # Verify the error message
+        self.assertEqual(
+            str(context.exception),
+            f"The file '{self.filename}' contains no items."
+        )
+
+    def test_comment_line(self):
+        """Test that a line starting with '#' isn't skipped as a comment."""
+        with open(self.filename, 'w') as f:
+            f.write("# value weight\n")
+            f.write("2 2\n")
+
+        with self.assertRaises(ValueError):
+            read_data(self.filename)
+
+    def test_blank_line(self):
+        """Test that blank lines between items are skipped."""
+        with open(self.filename, 'w') as f:
+            f.write("2 2\n")
+            f.write("\n")
+            f.write("5 1\n")
+
+        values_from_f, weights_from_f, _ = read_data(self.filename)
+
+        self.assertEqual(values_from_f.tolist(), [2, 5])
+        self.assertEqual(weights_from_f.tolist(), [2, 1])
+
     def test_custom_capacity(self):
         """Test reading very_small.txt with a custom capacity."""
         custom_capacity = 10
@@ -49,10 +85,20 @@ class TestReadData(unittest.TestCase):
         weights = [5, 4, 3, 2]
         values_from_f, weights_from_f, capacity = read_data('data/very_small.txt', custom_capacity)
 
-        self.assertEqual(values_from_f, values)
-        self.assertEqual(weights_from_f, weights)
+        self.assertEqual(values_from_f.tolist(), values)
+        self.assertEqual(weights_from_f.tolist(), weights)
         self.assertEqual(capacity, custom_capacity)
 
+    def test_zero_capacity(self):
+        """Test reading very_small.txt with a capacity of zero."""
+        with self.assertRaises(ValueError) as context:
+            read_data('data/very_small.txt', 0)
+
+        self.assertEqual(
+            str(context.exception),
+            "The capacity of the knapsack must be positive."
+        )
+
     def test_file_not_found(self):
         """Test reading a non-existent file."""
         non_existent_file = "non_existent_file.txt"
@@ -0,0 +1,33 @@
+import unittest
+
+from knapsack import read_data, build_knapsack_bqm, sample_bqm
+
+
+class TestSampleBqm(unittest.TestCase):
+    def setUp(self):
+        """Create the BQM of the smallest file."""
+        values, weights, capacity = read_data("data/very_small.txt", 10)
+        self.bqm = build_knapsack_bqm(values, weights, capacity)
+
+    def test_parallel_reads(self):
+        """Test that the reads are split among the worker processes."""
+        sampleset = sample_bqm(self.bqm, num_reads = 7, workers = 3, seed = 5)
+
+        self.assertEqual(len(sampleset), 7)
+
+    def test_more_workers_than_reads(self):
+        """Test that empty batches are not sampled."""
+        sampleset = sample_bqm(self.bqm, num_reads = 2, workers = 4, seed = 5)
+
+        self.assertEqual(len(sampleset), 2)
+
+    def test_same_seed(self):
+        """Test that a seed makes the parallel sampling reproducible."""
+        first = sample_bqm(self.bqm, num_reads = 6, workers = 2, seed = 5)
+        second = sample_bqm(self.bqm, num_reads = 6, workers = 2, seed = 5)
+
+        self.assertTrue((first.record.sample == second.record.sample).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+import contextlib
+import io
+import dimod
+
+from knapsack import read_data, show_solution
+
+
+class TestShowSolution(unittest.TestCase):
+    def test_variable_order(self):
+        """Test that the items don't depend on the order of the variables."""
+        values, weights, _ = read_data("data/very_small.txt", 10)
+        # Variables are ordered as 2, 0, 1, 3 in this sampleset.
+        sampleset = dimod.SampleSet.from_samples(
+            ([1, 1, 0, 1], [2, 0, 1, 3]), "BINARY", energy = 0,
+            sort_labels = False
+        )
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            show_solution(sampleset, values, weights)
+
+        self.assertEqual(
+            output.getvalue(),
+            "items of solution: [0, 2, 3]\n"
+            "with total value:9\n"
+            "with total weight:10\n"
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
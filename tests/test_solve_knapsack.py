@@ -0,0 +1,27 @@
+import unittest
+
+from knapsack import read_data, build_knapsack_bqm, solve_knapsack
+
+
+class TestSolveKnapsack(unittest.TestCase):
+    def test_solve_knapsack(self):
+        """Test that the pipeline matches the step by step solution."""
+        sampleset, values, weights, capacity_s = solve_knapsack(
+            "data/very_small.txt", 10, num_reads = 5, seed = 5
+        )
+        values_f, weights_f, capacity = read_data("data/very_small.txt", 10)
+        bqm = build_knapsack_bqm(values_f, weights_f, capacity)
+
+        self.assertEqual(values.tolist(), values_f.tolist())
+        self.assertEqual(weights.tolist(), weights_f.tolist())
+        self.assertEqual(capacity_s, capacity)
+        self.assertEqual(len(sampleset), 5)
+        # Energies of the samples must come from the same BQM.
+        self.assertEqual(
+            sampleset.record.energy.tolist(),
+            bqm.energies(sampleset).tolist()
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()